@@ -0,0 +1,34 @@
+import os
+import sys
+import pprint
+import logging
+from dotenv import load_dotenv
+
+from config_validator import ConfigValidator
+
+logger = logging.getLogger(__name__)
+
+OUTPUT_FILE = 'generated_config.py'
+
+def build_config(output_file: str = OUTPUT_FILE) -> None:
+    """Validate configuration and write it out as an importable Python module"""
+    load_dotenv()
+    validator = ConfigValidator()
+    config = validator.validate_config()
+
+    # The generated module holds credentials, so keep it readable by the owner only
+    fd = os.open(output_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    os.chmod(output_file, 0o600)
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        f.write("# Generated by build_config.py - do not edit or commit\n")
+        f.write(f"CONFIG = {pprint.pformat(config)}\n")
+
+    logger.info(f"Configuration written to {output_file}")
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(levelname)s - %(message)s')
+    try:
+        build_config(*sys.argv[1:2])
+    except Exception as e:
+        logger.error(f"Failed to build configuration: {e}")
+        sys.exit(1)
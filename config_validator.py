@@ -4,6 +4,21 @@ from typing import Dict, List, Any
 
 logger = logging.getLogger(__name__)
 
+# Validated configuration, populated on the first successful validate_config() call.
+# Shared by all callers; do not mutate.
+_CONFIG_CACHE = None
+
+def _validate_basic_proxy(config: Dict[str, Any]) -> bool:
+    """SOCKS5/HTTP proxies need nothing beyond server and port"""
+    return True
+
+def _validate_mtproto_proxy(config: Dict[str, Any]) -> bool:
+    """MTProto proxies additionally need a secret"""
+    if not config.get('proxy_secret'):
+        logger.warning("MTProto proxy requires proxy_secret")
+        return False
+    return True
+
 class ConfigValidator:
     """Validates and loads configuration from environment variables"""
     
@@ -25,12 +40,21 @@ class ConfigValidator:
     }
     
     def validate_config(self) -> Dict[str, Any]:
-        """Validate and return configuration dictionary"""
+        """Validate and return configuration dictionary
+        
+        The result is cached and the same dict is returned to every caller,
+        so treat it as read-only.
+        """
+        global _CONFIG_CACHE
+        if _CONFIG_CACHE is not None:
+            return _CONFIG_CACHE
+        
+        env = os.environ
         config = {}
         
         # Validate required variables
         for var_name, var_type in self.REQUIRED_VARS.items():
-            value = os.getenv(var_name)
+            value = env.get(var_name)
             if not value:
                 raise ValueError(f"Required environment variable {var_name} is missing")
             
@@ -43,15 +67,14 @@ class ConfigValidator:
                 raise ValueError(f"Invalid type for {var_name}: expected {var_type.__name__}")
         
         # Process channels
-        channels = config['channels'].split(',')
-        config['channels'] = [ch.strip() for ch in channels if ch.strip()]
+        config['channels'] = [s for s in (ch.strip() for ch in config['channels'].split(',')) if s]
         
         if not config['channels']:
             raise ValueError("No valid channels found in CHANNELS environment variable")
         
         # Validate optional variables
         for var_name, var_type in self.OPTIONAL_VARS.items():
-            value = os.getenv(var_name)
+            value = env.get(var_name)
             if value:
                 try:
                     if var_type == int:
@@ -74,31 +97,40 @@ class ConfigValidator:
         self._validate_urls(config)
         
         logger.info("Configuration validation completed successfully")
+        _CONFIG_CACHE = config
         return config
     
+    # Per-type proxy validators; each returns False to disable the proxy
+    _PROXY_VALIDATORS = {
+        'socks5': _validate_basic_proxy,
+        'http': _validate_basic_proxy,
+        'mtproto': _validate_mtproto_proxy,
+    }
+    
     def _validate_proxy_config(self, config: Dict[str, Any]) -> None:
         """Validate proxy configuration"""
-        proxy_type = config.get('proxy_type')
+        proxy_type = (config.get('proxy_type') or '').lower()
+        config['proxy_type'] = proxy_type or None
+        if not proxy_type:
+            return
+        
+        validator = self._PROXY_VALIDATORS.get(proxy_type)
+        if validator is None:
+            logger.warning(f"Unsupported proxy type: {proxy_type}. Supported types: {', '.join(self._PROXY_VALIDATORS)}")
+            config['proxy_type'] = None
+            return
+        
+        if not validator(config):
+            config['proxy_type'] = None
+            return
+        
         proxy_server = config.get('proxy_server')
         proxy_port = config.get('proxy_port')
-        
-        if proxy_type:
-            if proxy_type.lower() not in ['socks5', 'http', 'mtproto']:
-                logger.warning(f"Unsupported proxy type: {proxy_type}. Supported types: socks5, http, mtproto")
-                config['proxy_type'] = None
-            
-            if proxy_type.lower() == 'mtproto':
-                if not config.get('proxy_secret'):
-                    logger.warning("MTProto proxy requires proxy_secret")
-                    config['proxy_type'] = None
-            
-            if proxy_server and proxy_port:
-                if proxy_port < 1 or proxy_port > 65535:
-                    logger.warning(f"Invalid proxy port: {proxy_port}")
-                    config['proxy_port'] = None
-            else:
-                if proxy_type:
-                    logger.warning("Proxy type specified but server/port missing")
+        if not (proxy_server and proxy_port):
+            logger.warning("Proxy type specified but server/port missing")
+        elif proxy_port < 1 or proxy_port > 65535:
+            logger.warning(f"Invalid proxy port: {proxy_port}")
+            config['proxy_port'] = None
     
     def _validate_urls(self, config: Dict[str, Any]) -> None:
         """Validate URL format"""
@@ -1,9 +1,21 @@
-import logging
+import os
 import sys
+import queue
+import signal
+import atexit
+import logging
+import logging.handlers
 from datetime import datetime
 
+# Background listener that performs the actual handler I/O
+_queue_listener = None
+
+# SIGTERM handler that was active before setup_logger() installed its own
+_previous_sigterm_handler = None
+
 def setup_logger(name: str = 'telegram_ui_bot', level: str = 'INFO') -> logging.Logger:
     """Setup and configure logger for the application"""
+    global _queue_listener
     
     # Create logger
     logger = logging.getLogger(name)
@@ -11,13 +23,14 @@ def setup_logger(name: str = 'telegram_ui_bot', level: str = 'INFO') -> logging.
     
     # Clear any existing handlers
     logger.handlers.clear()
+    stop_logger()
     
     # Create console handler
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(logging.INFO)
     
     # Create file handler
-    file_handler = logging.FileHandler('telegram_bot.log', encoding='utf-8')
+    file_handler = logging.FileHandler('telegram_bot.log', encoding='utf-8', delay=True)
     file_handler.setLevel(logging.DEBUG)
     
     # Create formatter
@@ -30,9 +43,15 @@ def setup_logger(name: str = 'telegram_ui_bot', level: str = 'INFO') -> logging.
     console_handler.setFormatter(formatter)
     file_handler.setFormatter(formatter)
     
-    # Add handlers to logger
-    logger.addHandler(console_handler)
-    logger.addHandler(file_handler)
+    # Log calls only enqueue records; a background thread writes them out
+    # SimpleQueue.put is reentrant, so the SIGTERM handler can enqueue the stop sentinel safely
+    log_queue = queue.SimpleQueue()
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    _queue_listener = logging.handlers.QueueListener(
+        log_queue, console_handler, file_handler, respect_handler_level=True
+    )
+    _queue_listener.start()
+    _install_sigterm_handler()
     
     # Prevent propagation to root logger
     logger.propagate = False
@@ -45,7 +64,39 @@ def setup_logger(name: str = 'telegram_ui_bot', level: str = 'INFO') -> logging.
     
     return logger
 
-def set_telethon_log_level(level: str = 'WARNING'):
-    """Set Telethon library log level to reduce noise"""
-    telethon_logger = logging.getLogger('telethon')
-    telethon_logger.setLevel(getattr(logging, level.upper()))
+def stop_logger():
+    """Stop the background listener, flushing pending records to the handlers"""
+    global _queue_listener
+    if _queue_listener is None:
+        return
+    
+    _queue_listener.stop()
+    for handler in _queue_listener.handlers:
+        handler.close()
+    _queue_listener = None
+
+def _handle_sigterm(signum, frame):
+    """Drain queued records, then hand off to the previous SIGTERM handler"""
+    stop_logger()
+    previous = _previous_sigterm_handler
+    if callable(previous):
+        previous(signum, frame)
+    else:
+        # Terminate as the default SIGTERM action would
+        signal.signal(signum, signal.SIG_DFL)
+        os.kill(os.getpid(), signum)
+
+def _install_sigterm_handler():
+    """Flush logs on SIGTERM (used by Railway/Replit to stop the process), which skips atexit"""
+    global _previous_sigterm_handler
+    current = signal.getsignal(signal.SIGTERM)
+    if current is _handle_sigterm or current == signal.SIG_IGN:
+        return
+    
+    try:
+        _previous_sigterm_handler = signal.signal(signal.SIGTERM, _handle_sigterm)
+    except ValueError:
+        # Handlers can only be installed from the main thread; atexit still covers normal exits
+        pass
+
+atexit.register(stop_logger)
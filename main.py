@@ -1,6 +1,7 @@
 import os
 import asyncio
 import logging
+from collections import OrderedDict
 from dotenv import load_dotenv
 from telethon import TelegramClient, events
 from telethon.errors import FloodWaitError, SessionPasswordNeededError
@@ -22,22 +23,36 @@ class TelegramUIBot:
         self.message_processor = None
         self.channel_entities = []
         self.is_running = False
+        self._entity_cache = OrderedDict()  # Bounded LRU of channel/username -> entity
+        self.entity_cache_size = 10_000
         
     async def initialize(self):
         """Initialize the bot with configuration and validation"""
         try:
-            # Load and validate configuration
-            load_dotenv()
-            validator = ConfigValidator()
-            self.config = validator.validate_config()
-            logger.info("Configuration loaded and validated successfully")
+            # Prefer configuration pre-validated by build_config.py
+            try:
+                import generated_config
+                self.config = generated_config.CONFIG
+                logger.info("Loaded pre-validated configuration from generated_config")
+                
+                try:
+                    if os.path.getmtime('.env') > os.path.getmtime(generated_config.__file__):
+                        logger.warning(".env is newer than generated_config.py; run 'python -m build_config' to apply changes")
+                except OSError:
+                    pass
+            except ImportError:
+                # Load and validate configuration
+                load_dotenv()
+                validator = ConfigValidator()
+                self.config = validator.validate_config()
+                logger.info("Configuration loaded and validated successfully")
             
             # Initialize session handler
             self.session_handler = SessionHandler(self.config)
             self.client = await self.session_handler.create_client()
             
             # Initialize message processor
-            self.message_processor = MessageProcessor(self.config)
+            self.message_processor = MessageProcessor(self.config, get_entity=self._get_entity)
             
             return True
             
@@ -47,11 +62,18 @@ class TelegramUIBot:
     
     async def join_channels(self):
         """Join all configured channels and return their entities"""
-        entities = []
-        for channel in self.config['channels']:
-            if not channel.strip():
-                continue
-                
+        # Cap concurrent requests to avoid tripping FloodWait
+        semaphore = asyncio.Semaphore(8)
+        # Deduplicate so concurrent tasks never resolve the same channel twice
+        channels = dict.fromkeys(ch for ch in self.config['channels'] if ch.strip())
+        tasks = [self._join_one(channel, semaphore) for channel in channels]
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        
+        return [entity for entity in results if entity is not None and not isinstance(entity, BaseException)]
+    
+    async def _join_one(self, channel, semaphore):
+        """Join a single channel and return its entity, or None on failure"""
+        async with semaphore:
             try:
                 # Try to join the channel first
                 try:
@@ -61,14 +83,26 @@ class TelegramUIBot:
                     logger.warning(f"Could not join channel {channel}: {join_error}")
                 
                 # Get channel entity
-                entity = await self.client.get_entity(channel)
-                entities.append(entity)
+                entity = await self._get_entity(channel)
                 logger.info(f"Added channel entity: {channel}")
+                return entity
                 
             except Exception as e:
                 logger.error(f"Failed to process channel {channel}: {e}")
-                
-        return entities
+                return None
+    
+    async def _get_entity(self, key):
+        """Resolve an entity through the client, caching results in-process"""
+        entity = self._entity_cache.get(key)
+        if entity is not None:
+            self._entity_cache.move_to_end(key)
+            return entity
+        
+        entity = await self.client.get_entity(key)
+        self._entity_cache[key] = entity
+        if len(self._entity_cache) > self.entity_cache_size:
+            self._entity_cache.popitem(last=False)
+        return entity
     
     async def setup_message_handler(self):
         """Setup the message event handler"""
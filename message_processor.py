@@ -1,14 +1,21 @@
 import os
 import re
+import time
 import asyncio
 import logging
-from typing import Optional, List
+from collections import OrderedDict
+from typing import Optional, List, Callable, Awaitable, Any
 import google.generativeai as genai
 from telethon import TelegramClient
 from telethon.errors import FloodWaitError, UserPrivacyRestrictedError
 
 logger = logging.getLogger(__name__)
 
+# Contact extraction patterns
+_USERNAME_RE = re.compile(r'@([a-zA-Z0-9_]+)')
+_PHONE_RE = re.compile(r'(\+98|0)?9\d{9}')
+_EMAIL_RE = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b')
+
 class MessageProcessor:
     """Processes incoming messages and handles AI response generation"""
     
@@ -22,11 +29,41 @@ class MessageProcessor:
         'wireframe', 'prototype', 'mockup', 'طراحی موکاپ'
     ]
     
-    def __init__(self, config):
+    # Keywords are compiled once per class, not per message
+    _UI_KEYWORDS_RE = re.compile('|'.join(re.escape(k) for k in UI_KEYWORDS), re.IGNORECASE)
+    
+    # Constant parts of the Gemini prompt; only the job text is spliced in
+    _PROMPT_PREFIX = """
+با توجه به آگهی استخدام زیر، یک پیام حرفه‌ای و دوستانه به زبان فارسی برای ارسال به کارفرما بنویس. پیام باید:
+
+1. مودبانه و حرفه‌ای باشد
+2. اشتیاق و علاقه به همکاری را نشان دهد
+3. به طور خلاصه به تجربه مرتبط در زمینه طراحی UI/UX اشاره کند
+4. حداکثر 3-4 خط باشد
+5. با یک ایموجی مناسب شروع شود
+6. به درخواست ارسال نمونه کار یا رزومه اشاره کند
+
+متن آگهی:
+"""
+    _PROMPT_SUFFIX = """
+
+پیام شخصی‌سازی شده:
+"""
+    
+    def __init__(self, config, get_entity: Optional[Callable[[str], Awaitable[Any]]] = None):
         self.config = config
-        self.processed_messages = set()  # To avoid duplicate processing
+        self.get_entity = get_entity  # Shared (cached) entity lookup, defaults to client.get_entity
+        self.processed_messages = OrderedDict()  # Insertion-ordered set to avoid duplicate processing
         self.rate_limit_delay = 30  # Seconds between messages to same user
-        self.last_message_time = {}
+        self.last_message_time = OrderedDict()  # Bounded LRU of username -> last send time
+        self.max_tracked_users = 10_000
+        
+        # Recent AI responses keyed by normalized job text
+        self._response_cache = OrderedDict()
+        self.response_cache_size = 128
+        
+        # Resume location is cached once found and reused for every response
+        self._resume_path = None
         
         # Configure Gemini AI
         if self.config.get('gemini_api_key'):
@@ -42,13 +79,14 @@ class MessageProcessor:
     
     def contains_ui_keywords(self, text: str) -> bool:
         """Check if text contains UI/UX related keywords"""
-        text_lower = text.lower()
-        return any(keyword.lower() in text_lower for keyword in self.UI_KEYWORDS)
+        return self._UI_KEYWORDS_RE.search(text) is not None
     
     def extract_username(self, text: str) -> Optional[str]:
         """Extract username from text"""
         # Look for @username pattern
-        match = re.search(r'@([a-zA-Z0-9_]+)', text)
+        if '@' not in text:
+            return None
+        match = _USERNAME_RE.search(text)
         if match:
             return match.group(1)  # Return without @ symbol
         return None
@@ -63,12 +101,12 @@ class MessageProcessor:
             contact_info['username'] = username
         
         # Extract phone numbers (Iranian format)
-        phone_match = re.search(r'(\+98|0)?9\d{9}', text)
+        phone_match = _PHONE_RE.search(text) if '9' in text else None
         if phone_match:
             contact_info['phone'] = phone_match.group(0)
         
         # Extract email addresses
-        email_match = re.search(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', text)
+        email_match = _EMAIL_RE.search(text) if '@' in text else None
         if email_match:
             contact_info['email'] = email_match.group(0)
         
@@ -79,25 +117,22 @@ class MessageProcessor:
         if not self.model:
             return self._get_fallback_message()
         
-        prompt = f"""
-با توجه به آگهی استخدام زیر، یک پیام حرفه‌ای و دوستانه به زبان فارسی برای ارسال به کارفرما بنویس. پیام باید:
-
-1. مودبانه و حرفه‌ای باشد
-2. اشتیاق و علاقه به همکاری را نشان دهد
-3. به طور خلاصه به تجربه مرتبط در زمینه طراحی UI/UX اشاره کند
-4. حداکثر 3-4 خط باشد
-5. با یک ایموجی مناسب شروع شود
-6. به درخواست ارسال نمونه کار یا رزومه اشاره کند
-
-متن آگهی:
-{job_text}
-
-پیام شخصی‌سازی شده:
-"""
+        # Reposted job ads reuse the earlier AI response instead of a new API call
+        cache_key = ' '.join(job_text.split())
+        cached = self._response_cache.get(cache_key)
+        if cached is not None:
+            self._response_cache.move_to_end(cache_key)
+            return cached
+        
+        prompt = self._PROMPT_PREFIX + job_text + self._PROMPT_SUFFIX
         
         try:
             response = await self.model.generate_content_async(prompt)
-            return response.text.strip()
+            message = response.text.strip()
+            self._response_cache[cache_key] = message
+            if len(self._response_cache) > self.response_cache_size:
+                self._response_cache.popitem(last=False)
+            return message
         except Exception as e:
             logger.error(f"Error generating AI response: {e}")
             return self._get_fallback_message()
@@ -113,26 +148,37 @@ class MessageProcessor:
 
 با تشکر 🙏"""
     
-    async def send_response_to_user(self, client: TelegramClient, username: str, message: str) -> bool:
+    async def resolve_entity(self, client: TelegramClient, username: str):
+        """Resolve a user entity, returning None if it is unavailable"""
+        get_entity = self.get_entity or client.get_entity
+        try:
+            return await get_entity(username)
+        except ValueError:
+            logger.warning(f"User not found: {username}")
+            return None
+        except UserPrivacyRestrictedError:
+            logger.warning(f"User privacy restricted: {username}")
+            return None
+        except Exception as e:
+            logger.error(f"Error resolving user {username}: {e}")
+            return None
+    
+    async def send_response_to_user(self, client: TelegramClient, username: str, message: str, entity=None) -> bool:
         """Send personalized response and resume to user"""
         try:
             # Check rate limiting
-            current_time = asyncio.get_event_loop().time()
-            last_time = self.last_message_time.get(username, 0)
+            current_time = time.monotonic()
+            last_time = self.last_message_time.get(username)
             
-            if current_time - last_time < self.rate_limit_delay:
+            if last_time is not None and current_time - last_time < self.rate_limit_delay:
                 logger.info(f"Rate limiting: skipping message to {username}")
                 return False
             
-            # Get user entity
-            try:
-                entity = await client.get_entity(username)
-            except ValueError:
-                logger.warning(f"User not found: {username}")
-                return False
-            except UserPrivacyRestrictedError:
-                logger.warning(f"User privacy restricted: {username}")
-                return False
+            # Get user entity unless the caller already resolved it
+            if entity is None:
+                entity = await self.resolve_entity(client, username)
+                if entity is None:
+                    return False
             
             # Send text message
             await client.send_message(entity, message)
@@ -143,6 +189,9 @@ class MessageProcessor:
             
             # Update rate limiting tracker
             self.last_message_time[username] = current_time
+            self.last_message_time.move_to_end(username)
+            while len(self.last_message_time) > self.max_tracked_users:
+                self.last_message_time.popitem(last=False)
             return True
             
         except FloodWaitError as e:
@@ -152,8 +201,11 @@ class MessageProcessor:
             logger.error(f"Error sending message to {username}: {e}")
             return False
     
-    async def _send_resume_file(self, client: TelegramClient, entity, username: str):
-        """Send resume file to user"""
+    def _get_resume_path(self) -> Optional[str]:
+        """Locate the resume file, probing the filesystem until it is found"""
+        if self._resume_path is not None:
+            return self._resume_path
+        
         resume_filename = self.config.get('resume_filename', 'javad-rostami resume.pdf')
         
         # Try multiple possible paths for the resume file
@@ -164,12 +216,16 @@ class MessageProcessor:
             os.path.join(os.path.dirname(__file__), resume_filename)
         ]
         
-        resume_path = None
         for path in possible_paths:
             if os.path.exists(path):
-                resume_path = path
+                self._resume_path = path
                 break
         
+        return self._resume_path
+    
+    async def _send_resume_file(self, client: TelegramClient, entity, username: str):
+        """Send resume file to user"""
+        resume_path = self._get_resume_path()
         portfolio_url = self.config.get('portfolio_url', '')
         
         if resume_path:
@@ -202,7 +258,8 @@ class MessageProcessor:
             if not message_text or len(message_text.strip()) < 10:
                 return
             
-            logger.debug(f"Processing message: {message_text[:100]}...")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Processing message: %s...", message_text[:100])
             
             # Check if message contains UI/UX keywords
             if not self.contains_ui_keywords(message_text):
@@ -220,21 +277,28 @@ class MessageProcessor:
             
             logger.info(f"Found username: {username}")
             
-            # Generate personalized response
-            custom_message = await self.generate_custom_message(message_text)
+            # Generate personalized response while the user entity is resolved
+            custom_message, entity = await asyncio.gather(
+                self.generate_custom_message(message_text),
+                self.resolve_entity(client, username)
+            )
+            
+            if entity is None:
+                return
             
             # Send response
-            success = await self.send_response_to_user(client, username, custom_message)
+            success = await self.send_response_to_user(client, username, custom_message, entity)
             
             if success:
                 logger.info(f"Successfully processed and responded to job posting from {username}")
                 # Mark as processed
-                self.processed_messages.add(message_id)
+                self.processed_messages[message_id] = None
                 
                 # Clean up old processed messages to prevent memory issues
                 if len(self.processed_messages) > 1000:
                     # Keep only the last 500 messages
-                    self.processed_messages = set(list(self.processed_messages)[-500:])
+                    while len(self.processed_messages) > 500:
+                        self.processed_messages.popitem(last=False)
             
         except Exception as e:
             logger.error(f"Error in process_message: {e}")
@@ -3,6 +3,7 @@ import logging
 from typing import Dict, Any, Optional, Tuple
 from telethon import TelegramClient
 from telethon.network import connection
+from telethon.sessions import SQLiteSession
 
 logger = logging.getLogger(__name__)
 
@@ -12,15 +13,18 @@ class SessionHandler:
     def __init__(self, config: Dict[str, Any]):
         self.config = config
         self.session_name = 'telegram_ui_bot_session'
+        self._proxy_tuple = None
+        self._proxy_resolved = False
     
     async def create_client(self) -> TelegramClient:
         """Create and configure Telegram client with proxy if needed"""
         proxy_config = self._get_proxy_config()
+        session = self._create_session()
         
         if proxy_config:
             logger.info(f"Creating client with {proxy_config[0]} proxy: {proxy_config[1]}:{proxy_config[2]}")
             client = TelegramClient(
-                self.session_name,
+                session,
                 self.config['api_id'],
                 self.config['api_hash'],
                 proxy=proxy_config
@@ -28,15 +32,36 @@ class SessionHandler:
         else:
             logger.info("Creating client without proxy")
             client = TelegramClient(
-                self.session_name,
+                session,
                 self.config['api_id'],
                 self.config['api_hash']
             )
         
         return client
     
+    def _create_session(self):
+        """Create a SQLite session using WAL journaling to reduce fsyncs on startup"""
+        session = SQLiteSession(self.session_name)
+        session.save_entities = True
+        
+        # Relies on Telethon internals; keep default journaling if they change
+        try:
+            session._conn.execute('PRAGMA journal_mode=WAL')
+            session._conn.execute('PRAGMA synchronous=NORMAL')
+        except Exception as e:
+            logger.warning(f"Could not enable WAL for session storage, using defaults: {e}")
+        
+        return session
+    
     def _get_proxy_config(self) -> Optional[Tuple]:
-        """Get proxy configuration tuple for Telethon"""
+        """Get proxy configuration tuple for Telethon, built once and reused"""
+        if not self._proxy_resolved:
+            self._proxy_tuple = self._build_proxy_config()
+            self._proxy_resolved = True
+        return self._proxy_tuple
+    
+    def _build_proxy_config(self) -> Optional[Tuple]:
+        """Build proxy configuration tuple from config"""
         proxy_type = self.config.get('proxy_type')
         proxy_server = self.config.get('proxy_server')
         proxy_port = self.config.get('proxy_port')
@@ -82,9 +107,13 @@ class SessionHandler:
     def cleanup_session(self):
         """Clean up session files if needed"""
         session_file = f"{self.session_name}.session"
-        if os.path.exists(session_file):
+        
+        # WAL journaling may leave -wal/-shm side files next to the database
+        for path in (session_file, f"{session_file}-wal", f"{session_file}-shm"):
             try:
-                os.remove(session_file)
-                logger.info("Session file cleaned up")
-            except Exception as e:
-                logger.warning(f"Could not remove session file: {e}")
+                os.unlink(path)
+                logger.info(f"Session file cleaned up: {path}")
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning(f"Could not remove session file {path}: {e}")